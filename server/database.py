@@ -5,38 +5,101 @@ Uses MongoDB via pymongo.
 
 import os
 import json
-from typing import Optional, List
+import threading
+from typing import Optional, List, Union
 from datetime import datetime
 from pymongo import MongoClient, ASCENDING
-from pymongo.errors import ConnectionFailure
+from pymongo.errors import ConnectionFailure, DuplicateKeyError
+
+_client: Optional[MongoClient] = None
+_client_lock = threading.Lock()
 
 
 def get_client():
-    uri = os.environ.get("MONGODB_URI", "mongodb://localhost:27017/")
-    return MongoClient(uri)
+    """Shared MongoClient, created on first use. MongoClient is thread-safe and pools connections."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                uri = os.environ.get("MONGODB_URI", "mongodb://localhost:27017/")
+                # Bound every blocking call so a slow or unreachable Mongo fails
+                # fast instead of stalling for pymongo's default 30s.
+                timeout_ms = int(os.environ.get("MONGODB_TIMEOUT_MS", "2000"))
+                _client = MongoClient(
+                    uri,
+                    serverSelectionTimeoutMS=timeout_ms,
+                    connectTimeoutMS=timeout_ms,
+                    socketTimeoutMS=timeout_ms * 5,
+                )
+    return _client
+
+
+def get_db():
+    db_name = os.environ.get("MONGODB_DB", "knotlink")
+    return get_client()[db_name]
 
 
 def get_collection():
-    client = get_client()
-    db_name = os.environ.get("MONGODB_DB", "knotlink")
-    return client[db_name]["games"]
+    return get_db()["games"]
+
+
+def ping() -> bool:
+    """Round-trip to the server; raises if Mongo is unreachable within the timeout."""
+    get_client().admin.command("ping")
+    return True
 
 
-def init_db():
+def _migration_1_indexes(db):
     """Create indexes for common research queries."""
-    col = get_collection()
+    col = db["games"]
     col.create_index([("game_id", ASCENDING)], unique=True)
     col.create_index([("is_unknot", ASCENDING)])
     col.create_index([("num_crossings", ASCENDING)])
     col.create_index([("jones_poly_is_one", ASCENDING)])
     col.create_index([("created_at", ASCENDING)])
-    print("MongoDB indexes created successfully")
+
+
+# Ordered list of (version, migration). Append new steps; never reorder.
+MIGRATIONS = [
+    (1, _migration_1_indexes),
+]
+
+
+def migrate():
+    """
+    Apply any pending schema migrations and record them in the
+    `migrations` collection. The server runs this in the background at
+    startup; it costs a single query when nothing is pending. It can also
+    be run by hand:
+
+        python database.py
+    """
+    db = get_db()
+    applied = {m["version"] for m in db["migrations"].find({}, {"version": 1})}
+    pending = [(version, step) for version, step in MIGRATIONS if version not in applied]
+    if not pending:
+        return
+
+    # Concurrent runs may both apply a step (each step is idempotent), but
+    # only one of them can record it.
+    db["migrations"].create_index([("version", ASCENDING)], unique=True)
+    for version, step in pending:
+        step(db)
+        try:
+            db["migrations"].insert_one({
+                "version": version,
+                "name": step.__name__,
+                "applied_at": datetime.utcnow(),
+            })
+        except DuplicateKeyError:
+            continue
+        print(f"Applied migration {version}: {step.__name__}")
 
 
 def save_game_result(
     game_id: str,
-    initial_board: List,
-    final_board: List,
+    initial_board: Union[List, dict],
+    final_board: Union[List, dict],
     rows: int,
     cols: int,
     num_unresolved: int,
@@ -44,10 +107,15 @@ def save_game_result(
     winner: Optional[str],
     move_sequence: List,
     classification: Optional[dict],
+    local_classification: Optional[dict] = None,
 ):
     """
     Persist a completed game to MongoDB.
     Upserts so it's safe to call multiple times for the same game.
+
+    Boards are stored as given: dense games keep their rows x cols matrices,
+    sparse games keep the {"rows", "cols", "tiles"} coordinate list, so
+    document size scales with occupied tiles. `board_format` records which.
     """
     is_unknot = None
     num_crossings = None
@@ -74,6 +142,7 @@ def save_game_result(
         "created_at": datetime.utcnow(),
 
         # Board data
+        "board_format": "sparse" if isinstance(final_board, dict) else "dense",
         "initial_board": initial_board,
         "final_board": final_board,
         "rows": rows,
@@ -92,6 +161,9 @@ def save_game_result(
         "classification_method": classification_method,
         "gauss_code": gauss_code,
 
+        # Jones polynomial computed in-process (kauffman_bracket.classify_locally)
+        "local_classification": local_classification,
+
         # Research flag
         "jones_poly_is_one": jones_poly_is_one,
     }
@@ -152,4 +224,11 @@ def get_stats():
         "jones_poly_one_candidates": col.count_documents({"jones_poly_is_one": True}),
         "knotter_wins": col.count_documents({"winner": "knotter"}),
         "unknotter_wins": col.count_documents({"winner": "unknotter"}),
-    }
\ No newline at end of file
+    }
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    migrate()
+    print("MongoDB migrations up to date")
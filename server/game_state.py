@@ -4,10 +4,13 @@ Handles game initialization, move validation, and state updates.
 """
 
 from enum import Enum
-from typing import List, Tuple, Optional
+from typing import TYPE_CHECKING, Dict, List, Tuple, Optional, Union
 from dataclasses import dataclass
 import copy
 
+if TYPE_CHECKING:
+    from kauffman_bracket import PartialBracket
+
 
 class Player(Enum):
     """Enum representing the two players."""
@@ -23,6 +26,90 @@ class TileType(Enum):
     UNRESOLVED = -1
 
 
+# Boards with more unresolved crossings than this are not tracked locally:
+# the symbolic bracket holds 2^k polynomials for k unresolved crossings.
+MAX_SYMBOLIC_CROSSINGS = 12
+
+
+# Largest rows * cols accepted for a sparse board. A sparse request stays
+# small however large it claims the board is, but dense responses and the
+# classifier expand it in full.
+MAX_BOARD_AREA = 1_000_000
+
+
+# Sparse boards list only non-empty tiles:
+#     {"rows": 4, "cols": 4, "tiles": [[0, 1, 2], [0, 2, 1], ...]}
+# where each entry is [row, col, tile]. Every other tile is EMPTY (0).
+SparseBoard = dict
+Board = Union[List[List[int]], SparseBoard]
+
+BOARD_FORMATS = ("dense", "sparse")
+
+
+def is_sparse_board(board) -> bool:
+    """True if the board is in the sparse coordinate-list format."""
+    return isinstance(board, dict)
+
+
+def _is_int(value) -> bool:
+    """JSON integer check; bool is an int subclass but not a valid tile or index."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def parse_sparse_board(board: SparseBoard) -> Tuple[int, int, Dict[Tuple[int, int], int]]:
+    """
+    Validate a sparse board and return (rows, cols, {(row, col): tile}).
+    Explicit EMPTY entries are dropped.
+    """
+    rows, cols, tiles = board.get("rows"), board.get("cols"), board.get("tiles", [])
+    if not _is_int(rows) or not _is_int(cols) or rows < 0 or cols < 0:
+        raise ValueError("Sparse board requires non-negative integer 'rows' and 'cols'")
+    if rows * cols > MAX_BOARD_AREA:
+        raise ValueError(f"Sparse board is too large: rows * cols must be at most {MAX_BOARD_AREA}")
+    if not isinstance(tiles, list):
+        raise ValueError("Sparse board 'tiles' must be a list of [row, col, tile] entries")
+
+    parsed: Dict[Tuple[int, int], int] = {}
+    seen = set()
+    for entry in tiles:
+        if not isinstance(entry, list) or len(entry) != 3 or not all(_is_int(v) for v in entry):
+            raise ValueError(f"Invalid sparse tile entry {entry}: expected [row, col, tile]")
+        row, col, tile = entry
+        if row < 0 or row >= rows or col < 0 or col >= cols:
+            raise ValueError(f"Sparse tile position ({row}, {col}) is out of bounds")
+        if (row, col) in seen:
+            raise ValueError(f"Duplicate sparse tile at ({row}, {col})")
+        seen.add((row, col))
+        if tile != TileType.EMPTY.value:
+            parsed[(row, col)] = tile
+    return rows, cols, parsed
+
+
+def sparse_to_dense(board: SparseBoard) -> List[List[int]]:
+    """Expand a sparse board into a rows x cols matrix."""
+    rows, cols, tiles = parse_sparse_board(board)
+    dense = [[TileType.EMPTY.value] * cols for _ in range(rows)]
+    for (row, col), tile in tiles.items():
+        dense[row][col] = tile
+    return dense
+
+
+def dense_to_sparse(board: List[List[int]]) -> SparseBoard:
+    """List the non-empty tiles of a dense board in row-major order."""
+    rows = len(board)
+    cols = len(board[0]) if rows > 0 else 0
+    return {
+        "rows": rows,
+        "cols": cols,
+        "tiles": [
+            [i, j, tile]
+            for i, row in enumerate(board)
+            for j, tile in enumerate(row)
+            if tile != TileType.EMPTY.value
+        ],
+    }
+
+
 @dataclass
 class GameMove:
     """Represents a move in the game."""
@@ -35,48 +122,97 @@ class GameMove:
 class GameState:
     """
     Manages the state of the Knotting/Unknotting game.
+
+    A game created from a sparse board stays sparse: only non-empty tiles are
+    kept, in `tiles`, and `board` is None. Dense games keep the full matrix
+    in `board`.
     """
-    def __init__(self, initial_board: List[List[int]], starting_player: Player):
+    def __init__(self, initial_board: Board, starting_player: Player):
         """
         Initialize the game state.
 
         Args:
-            initial_board: 2D matrix representing the knot mosaic
+            initial_board: 2D matrix or sparse board representing the knot mosaic
             starting_player: Which player goes first (KNOTTER or UNKNOTTER)
         """
-        if not isinstance(initial_board, list) or any(not isinstance(r, list) for r in initial_board):
-            raise ValueError("Board must be a 2D list of integers")
-
-        self.board = copy.deepcopy(initial_board)
-        self.rows = len(initial_board)
-        self.cols = len(initial_board[0]) if self.rows > 0 else 0
+        self._load_board(initial_board)
         self.current_player = starting_player
         self.move_history: List[GameMove] = []
         self.game_over = False
         self.winner: Optional[Player] = None
         self.is_unknot: Optional[bool] = None
-        self.initial_board: List[List[int]] = copy.deepcopy(initial_board)
+        self.initial_board: Board = copy.deepcopy(initial_board)
         self.starting_player_str: str = starting_player.value
 
-        if not self._validate_board_dimensions():
-            raise ValueError("Invalid board: rows must all have the same length")
-
         if self.rows == 0 or self.cols == 0:
             self.game_over = True
 
-    def _validate_board_dimensions(self) -> bool:
+        self.bracket: Optional["PartialBracket"] = self._build_bracket()
+
+    def _load_board(self, board: Board):
+        """
+        Validate a dense or sparse board and make it the current board.
+        Nothing is changed if the board is invalid.
+        """
+        if is_sparse_board(board):
+            rows, cols, tiles = parse_sparse_board(board)
+            self.sparse, self.board, self.tiles = True, None, tiles
+            self.rows, self.cols = rows, cols
+            return
+
+        if not isinstance(board, list) or any(not isinstance(r, list) for r in board):
+            raise ValueError("Board must be a 2D list of integers")
+        rows = len(board)
+        cols = len(board[0]) if rows > 0 else 0
+        if not self._validate_board_dimensions(board, cols):
+            raise ValueError("Invalid board: rows must all have the same length")
+        self.sparse, self.board, self.tiles = False, copy.deepcopy(board), None
+        self.rows, self.cols = rows, cols
+
+    def get_tile(self, row: int, col: int) -> int:
+        """Tile at (row, col)."""
+        if self.sparse:
+            return self.tiles.get((row, col), TileType.EMPTY.value)
+        return self.board[row][col]
+
+    def _set_tile(self, row: int, col: int, tile: int):
+        if self.sparse:
+            self.tiles[(row, col)] = tile
+        else:
+            self.board[row][col] = tile
+
+    def _build_bracket(self) -> Optional["PartialBracket"]:
+        """
+        Symbolic bracket over the current unresolved crossings, or None if the
+        board cannot be tracked locally (not a valid mosaic, or too many
+        unresolved crossings). Classification then falls back to the service.
+        """
+        if len(self.get_unresolved_positions()) > MAX_SYMBOLIC_CROSSINGS:
+            return None
+        # Imported here so that loading the server does not pull in NumPy.
+        from kauffman_bracket import PartialBracket
+
+        board, origin = self.get_cropped_board()
+        try:
+            return PartialBracket(board, origin)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _validate_board_dimensions(board: List[List[int]], cols: int) -> bool:
         """Ensure all rows have the same number of columns."""
-        if self.rows == 0:
-            return True
-        expected_cols = self.cols
-        return all(len(row) == expected_cols for row in self.board)
+        return all(len(row) == cols for row in board)
 
     def has_unresolved_crossings(self) -> bool:
         """True if any tile is UNRESOLVED (-1)."""
+        if self.sparse:
+            return any(tile == TileType.UNRESOLVED.value for tile in self.tiles.values())
         return any(tile == TileType.UNRESOLVED.value for row in self.board for tile in row)
 
     def get_unresolved_positions(self) -> List[Tuple[int, int]]:
         """List of (row, col) positions with unresolved crossings."""
+        if self.sparse:
+            return sorted(pos for pos, tile in self.tiles.items() if tile == TileType.UNRESOLVED.value)
         return [
             (i, j)
             for i in range(self.rows)
@@ -105,7 +241,7 @@ class GameState:
         if row < 0 or row >= self.rows or col < 0 or col >= self.cols:
             return False, f"Position ({row}, {col}) is out of bounds."
 
-        current_tile = self.board[row][col]
+        current_tile = self.get_tile(row, col)
         if current_tile != TileType.UNRESOLVED.value:
             return False, f"Position ({row}, {col}) is not an unresolved crossing (expected -1, found {current_tile})."
 
@@ -131,8 +267,10 @@ class GameState:
             return False, error_msg
 
         # apply the move
-        self.board[row][col] = new_tile
+        self._set_tile(row, col, new_tile)
         self.move_history.append(GameMove(row, col, new_tile, self.current_player))
+        if self.bracket is not None:
+            self.bracket.resolve(row, col, new_tile)
 
         # check for end of game
         if not self.has_unresolved_crossings():
@@ -143,56 +281,185 @@ class GameState:
         self.current_player = Player.UNKNOTTER if self.current_player == Player.KNOTTER else Player.KNOTTER
         return True, f"Move accepted. Next player: {self.current_player.value}"
 
-    def get_board_state(self) -> List[List[int]]:
-        """Deep copy of the board."""
+    def undo_move(self, row: int, col: int) -> Tuple[bool, str]:
+        """
+        Restore a cell to unresolved (-1) and drop the last move from history.
+
+        Args:
+            row: Row index of the tile to restore
+            col: Column index of the tile to restore
+
+        Returns:
+            Tuple of (success, message)
+        """
+        if row < 0 or row >= self.rows or col < 0 or col >= self.cols:
+            return False, f"Position ({row}, {col}) is out of bounds"
+
+        previous_tile = self.get_tile(row, col)
+        self._set_tile(row, col, TileType.UNRESOLVED.value)
+        if self.move_history:
+            last = self.move_history.pop()
+            if (last.row, last.col) == (row, col):
+                self.current_player = last.player
+        self.game_over = False
+        self.winner = None
+        self.is_unknot = None
+
+        if self.bracket is not None and self.bracket.tracks(row, col):
+            if previous_tile != TileType.UNRESOLVED.value:
+                self.bracket.unresolve(row, col)
+        else:
+            self.bracket = self._build_bracket()
+
+        return True, "Move undone."
+
+    def local_jones_is_one(self) -> Optional[bool]:
+        """
+        Whether the locally computed Jones polynomial of the resolved board is 1.
+        None mid-game or when the board is not tracked locally.
+
+        Provisional only: `winner` and `is_unknot` are set from the classifier.
+        A nontrivial knot (or a link) can disagree with this.
+        """
+        if self.bracket is None or not self.bracket.is_complete():
+            return None
+        return self.bracket.jones_is_one()
+
+    def forced_jones_is_one(self) -> Optional[bool]:
+        """
+        True or False if every way of resolving the remaining crossings gives
+        the same answer to local_jones_is_one, otherwise None (also None when
+        the board is not tracked locally).
+        """
+        if self.bracket is None:
+            return None
+        return self.bracket.forced_jones_is_one()
+
+    def local_classification(self) -> Optional[dict]:
+        """
+        Locally computed Jones polynomial summary of the resolved board (see
+        kauffman_bracket.classify_locally), or None while crossings remain.
+        Read from the tracked bracket when there is one.
+        """
+        if self.has_unresolved_crossings():
+            return None
+        if self.bracket is not None:
+            return self.bracket.classification()
+        from kauffman_bracket import classify_locally
+
+        return classify_locally(self.get_cropped_board()[0])
+
+    def get_dense_board(self) -> List[List[int]]:
+        """Copy of the board as a rows x cols matrix, whatever the storage mode."""
+        if self.sparse:
+            dense = [[TileType.EMPTY.value] * self.cols for _ in range(self.rows)]
+            for (row, col), tile in self.tiles.items():
+                dense[row][col] = tile
+            return dense
         return copy.deepcopy(self.board)
 
-    def get_game_status(self) -> dict:
-        """Comprehensive game status."""
+    def get_cropped_board(self) -> Tuple[List[List[int]], Tuple[int, int]]:
+        """
+        The smallest dense matrix holding every non-empty tile, and the
+        (row, col) of its top-left corner. Empty border rows and columns do
+        not change the knot, so local analysis runs on this instead of the
+        full board; for sparse games it costs O(occupied tiles).
+        """
+        if self.sparse:
+            tiles = self.tiles
+        else:
+            tiles = {
+                (i, j): tile
+                for i, row in enumerate(self.board)
+                for j, tile in enumerate(row)
+                if tile != TileType.EMPTY.value
+            }
+        if not tiles:
+            return [], (0, 0)
+        r0 = min(i for i, _ in tiles)
+        c0 = min(j for _, j in tiles)
+        r1 = max(i for i, _ in tiles)
+        c1 = max(j for _, j in tiles)
+        cropped = [[TileType.EMPTY.value] * (c1 - c0 + 1) for _ in range(r1 - r0 + 1)]
+        for (i, j), tile in tiles.items():
+            cropped[i - r0][j - c0] = tile
+        return cropped, (r0, c0)
+
+    def get_sparse_board(self) -> SparseBoard:
+        """The board as a sparse coordinate list, whatever the storage mode."""
+        if self.sparse:
+            return {
+                "rows": self.rows,
+                "cols": self.cols,
+                "tiles": [[row, col, tile] for (row, col), tile in sorted(self.tiles.items())],
+            }
+        return dense_to_sparse(self.board)
+
+    def get_board_state(self, board_format: Optional[str] = None) -> Board:
+        """
+        Copy of the board in `board_format` ("dense" or "sparse"), defaulting
+        to the format the game was created with.
+        """
+        if board_format is None:
+            board_format = "sparse" if self.sparse else "dense"
+        if board_format not in BOARD_FORMATS:
+            raise ValueError("board format must be 'dense' or 'sparse'")
+        return self.get_sparse_board() if board_format == "sparse" else self.get_dense_board()
+
+    def count_initial_unresolved(self) -> int:
+        """Number of unresolved crossings on the board the game started from."""
+        if is_sparse_board(self.initial_board):
+            _, _, tiles = parse_sparse_board(self.initial_board)
+            return sum(1 for tile in tiles.values() if tile == TileType.UNRESOLVED.value)
+        return sum(1 for row in self.initial_board for cell in row if cell == TileType.UNRESOLVED.value)
+
+    def get_game_status(self, board_format: Optional[str] = None) -> dict:
+        """Comprehensive game status, with the board in `board_format`."""
         unresolved_positions = self.get_unresolved_positions()
         return {
             "current_player": self.current_player.value,
             "game_over": self.game_over,
-            "board": self.get_board_state(),
+            "board": self.get_board_state(board_format),
             "unresolved_count": len(unresolved_positions),
             "unresolved_positions": unresolved_positions,
             "move_count": len(self.move_history),
             "rows": self.rows,
             "cols": self.cols,
             "winner": self.winner.value if self.winner else None,
-            "is_unknot": self.is_unknot
+            "is_unknot": self.is_unknot,
+            "local_jones_is_one": self.local_jones_is_one(),
+            "forced_jones_is_one": self.forced_jones_is_one()
         }
 
-    def reset_game(self, initial_board: Optional[List[List[int]]] = None, starting_player: Optional[Player] = None):
+    def reset_game(self, initial_board: Optional[Board] = None, starting_player: Optional[Player] = None):
         """
         Reset the game to initial state.
 
         Args:
-            initial_board: Optional new board configuration
+            initial_board: Optional new board configuration (dense or sparse)
             starting_player: Optional new starting player
         """
         if initial_board is not None:
-            if not isinstance(initial_board, list) or any(not isinstance(r, list) for r in initial_board):
-                raise ValueError("Board must be a 2D list of integers")
-            self.board = copy.deepcopy(initial_board)
-            self.rows = len(initial_board)
-            self.cols = len(initial_board[0]) if self.rows > 0 else 0
+            self._load_board(initial_board)
+            self.initial_board = copy.deepcopy(initial_board)
 
         if starting_player is not None:
             self.current_player = starting_player
+            self.starting_player_str = starting_player.value
 
         self.move_history.clear()
         self.game_over = not self.has_unresolved_crossings() or self.rows == 0 or self.cols == 0
         self.winner = None
         self.is_unknot = None
+        self.bracket = self._build_bracket()
 
 
-def create_game(board: List[List[int]], starting_player: str) -> GameState:
+def create_game(board: Board, starting_player: str) -> GameState:
     """
     Factory function to create a new game instance.
 
     Args:
-        board: Initial board configuration
+        board: Initial board configuration, dense or sparse
         starting_player: "knotter" or "unknotter"
 
     Returns:
@@ -8,24 +8,48 @@ load_dotenv()  # Must be first before any os.environ.get() calls
 
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-from game_state import GameState, Player, create_game
-from database import init_db, save_game_result
+from game_state import BOARD_FORMATS, GameState, Player, create_game
 from typing import Dict
+import threading
 import uuid
-import requests
 import os
 
 app = Flask(__name__)
 CORS(app)
 
-try:
-    init_db()
-    print("Database initialized successfully")
-except Exception as e:
-    print(f"Warning: Could not initialize database: {e}")
-
 active_games: Dict[str, GameState] = {}
 CLASSIFIER_URL = os.environ.get('CLASSIFIER_URL', 'http://localhost:5001/api/classify')
+CLASSIFIER_HEALTH_URL = os.environ.get(
+    'CLASSIFIER_HEALTH_URL',
+    CLASSIFIER_URL.rsplit('/', 1)[0] + '/health'
+)
+READINESS_TIMEOUT = float(os.environ.get('READINESS_TIMEOUT', '2'))
+
+
+def _warm_up_db():
+    """
+    Import pymongo, open the shared Mongo connection and apply any pending
+    migrations (see database.migrate), all off the request path.
+    """
+    try:
+        from database import migrate, ping
+        ping()
+        print("Database connection established")
+        migrate()
+    except Exception as e:
+        print(f"Warning: Could not connect to database: {e}")
+
+
+threading.Thread(target=_warm_up_db, name="db-warm-up", daemon=True).start()
+
+
+def _board_format():
+    """Board format requested with ?format=dense|sparse, or None for the game's own."""
+    board_format = request.args.get('format')
+    if board_format is not None and board_format not in BOARD_FORMATS:
+        raise ValueError("format must be 'dense' or 'sparse'")
+    return board_format
+
 
 @app.route('/api/game/new', methods=['POST'])
 def new_game():
@@ -37,8 +61,14 @@ def new_game():
         "board": [[0, 0, -1, ...], ...],
         "starting_player": "knotter" or "unknotter"
     }
+
+    The board may instead be sparse, listing only non-empty tiles:
+        "board": {"rows": 4, "cols": 4, "tiles": [[row, col, tile], ...]}
+    Responses then return the board in the same format unless
+    ?format=dense|sparse is given.
     """
     try:
+        board_format = _board_format()
         data = request.get_json(force=True, silent=False)
         board = data.get('board')
         starting_player = data.get('starting_player', 'knotter')
@@ -52,7 +82,7 @@ def new_game():
 
         return jsonify({
             "game_id": game_id,
-            "status": game.get_game_status()
+            "status": game.get_game_status(board_format)
         }), 201
 
     except Exception as e:
@@ -61,11 +91,14 @@ def new_game():
 
 @app.route('/api/game/<game_id>/status', methods=['GET'])
 def get_game_status(game_id: str):
-    """Get current game status."""
+    """Get current game status. Optional query: ?format=dense|sparse"""
     game = active_games.get(game_id)
     if not game:
         return jsonify({"error": "Game not found"}), 404
-    return jsonify(game.get_game_status()), 200
+    try:
+        return jsonify(game.get_game_status(_board_format())), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
 
 @app.route('/api/game/<game_id>/move', methods=['POST'])
@@ -85,6 +118,7 @@ def make_move(game_id: str):
         return jsonify({"error": "Game not found"}), 404
 
     try:
+        board_format = _board_format()
         data = request.get_json(force=True, silent=False)
         row = data.get('row')
         col = data.get('col')
@@ -97,7 +131,7 @@ def make_move(game_id: str):
         response = {
             "success": success,
             "message": message,
-            "status": game.get_game_status()
+            "status": game.get_game_status(board_format)
         }
         return jsonify(response), (200 if success else 400)
 
@@ -115,6 +149,7 @@ def undo_move(game_id: str):
         return jsonify({"error": "Game not found"}), 404
 
     try:
+        board_format = _board_format()
         data = request.get_json(force=True, silent=False)
         row = data.get('row')
         col = data.get('col')
@@ -122,19 +157,13 @@ def undo_move(game_id: str):
         if row is None or col is None:
             return jsonify({"error": "row and col are required"}), 400
 
-        row, col = int(row), int(col)
-        if row < 0 or row >= game.rows or col < 0 or col >= game.cols:
-            return jsonify({"error": f"Position ({row}, {col}) is out of bounds"}), 400
-
-        # Restore cell to unresolved and remove last move from history
-        game.board[row][col] = -1
-        if game.move_history:
-            game.move_history.pop()
-        game.game_over = False
+        success, message = game.undo_move(int(row), int(col))
+        if not success:
+            return jsonify({"error": message}), 400
 
         return jsonify({
             "success": True,
-            "status": game.get_game_status()
+            "status": game.get_game_status(board_format)
         }), 200
 
     except Exception as e:
@@ -151,15 +180,26 @@ def classify_board(game_id: str):
     if not game:
         return jsonify({"error": "Game not found"}), 404
 
+    import requests
+
+    try:
+        board_format = _board_format()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # Get current board state; the classifier only accepts dense mosaics
+    board = game.get_board_state(board_format)
+    mosaic = game.get_dense_board()
+
+    # Check if there are any unresolved crossings
+    unresolved = game.has_unresolved_crossings()
+
+    # Computed up front so it is returned even when the classifier fails
+    local_classification = game.local_classification()
+
     try:
-        # Get current board state
-        board = game.get_board_state()
-        
-        # Check if there are any unresolved crossings
-        unresolved = game.has_unresolved_crossings()
-        
         # Call the classifier service
-        response = requests.post(CLASSIFIER_URL, json={'mosaic': board}, timeout=10)
+        response = requests.post(CLASSIFIER_URL, json={'mosaic': mosaic}, timeout=10)
         
         if response.status_code == 200:
             classifier_result = response.json()
@@ -185,20 +225,19 @@ def classify_board(game_id: str):
 
                     # Save every completed game to MongoDB
                     try:
+                        from database import save_game_result
                         save_game_result(
                             game_id=game_id,
-                            initial_board=getattr(game, 'initial_board', board),
-                            final_board=board,
+                            initial_board=game.initial_board,
+                            final_board=game.get_board_state(),
                             rows=game.rows,
                             cols=game.cols,
-                            num_unresolved=sum(
-                                1 for row in getattr(game, 'initial_board', board)
-                                for cell in row if cell == -1
-                            ),
+                            num_unresolved=game.count_initial_unresolved(),
                             starting_player=getattr(game, 'starting_player_str', 'unknotter'),
                             winner=game.winner.value if game.winner else None,
                             move_sequence=move_sequence,
                             classification=classifier_result,
+                            local_classification=local_classification,
                         )
                     except Exception as db_err:
                         print(f"Warning: Failed to save game to database: {db_err}")
@@ -206,6 +245,7 @@ def classify_board(game_id: str):
             return jsonify({
                 "board": board,
                 "classification": classifier_result,
+                "local_classification": local_classification,
                 "game_complete": not unresolved,
                 "unresolved_crossings": len(game.get_unresolved_positions()),
                 "winner": game.winner.value if game.winner else None
@@ -213,18 +253,23 @@ def classify_board(game_id: str):
         else:
             return jsonify({
                 "error": "Classifier service error",
-                "details": response.json()
+                "details": response.json(),
+                "local_classification": local_classification
             }), response.status_code
             
     except requests.exceptions.ConnectionError:
         return jsonify({
             "error": "Cannot connect to classifier service",
-            "hint": "Make sure classifier_service.py is running on port 5001"
+            "hint": "Make sure classifier_service.py is running on port 5001",
+            "local_classification": local_classification
         }), 503
     except requests.exceptions.Timeout:
-        return jsonify({"error": "Classifier service timeout"}), 504
+        return jsonify({
+            "error": "Classifier service timeout",
+            "local_classification": local_classification
+        }), 504
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return jsonify({"error": str(e), "local_classification": local_classification}), 500
 
 
 @app.route('/api/game/<game_id>/validate', methods=['POST'])
@@ -266,7 +311,7 @@ def reset_game(game_id: str):
 
     Optional JSON body:
     {
-        "board": [[...]] (optional),
+        "board": [[...]] or {"rows": ..., "cols": ..., "tiles": [...]} (optional),
         "starting_player": "knotter" or "unknotter" (optional)
     }
     """
@@ -275,6 +320,7 @@ def reset_game(game_id: str):
         return jsonify({"error": "Game not found"}), 404
 
     try:
+        board_format = _board_format()
         data = request.get_json(force=True, silent=False) or {}
         board = data.get('board')
         starting_player_str = data.get('starting_player')
@@ -290,7 +336,7 @@ def reset_game(game_id: str):
 
         return jsonify({
             "message": "Game reset successfully",
-            "status": game.get_game_status()
+            "status": game.get_game_status(board_format)
         }), 200
 
     except Exception as e:
@@ -308,10 +354,43 @@ def delete_game(game_id: str):
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    """Health check endpoint."""
+    """Liveness probe. Never touches the database or classifier."""
     return jsonify({"status": "healthy", "active_games": len(active_games)}), 200
 
 
+@app.route('/api/ready', methods=['GET'])
+def readiness_check():
+    """
+    Readiness probe. Returns 200 only when MongoDB answers a ping (bounded by
+    MONGODB_TIMEOUT_MS) and then the classifier's health endpoint answers
+    (bounded by READINESS_TIMEOUT), otherwise 503. The checks run one after
+    the other, so the probe can take up to the sum of both timeouts.
+    """
+    checks = {}
+
+    try:
+        from database import ping
+        ping()
+        checks["database"] = {"ok": True}
+    except Exception as e:
+        checks["database"] = {"ok": False, "error": str(e)}
+
+    try:
+        import requests
+        response = requests.get(CLASSIFIER_HEALTH_URL, timeout=READINESS_TIMEOUT)
+        checks["classifier"] = {"ok": response.status_code == 200}
+        if response.status_code != 200:
+            checks["classifier"]["error"] = f"HTTP {response.status_code}"
+    except Exception as e:
+        checks["classifier"] = {"ok": False, "error": str(e)}
+
+    ready = all(c["ok"] for c in checks.values())
+    return jsonify({
+        "status": "ready" if ready else "unavailable",
+        "checks": checks
+    }), (200 if ready else 503)
+
+
 @app.route('/api/research/interesting-games', methods=['GET'])
 def interesting_games():
     """Return all nontrivial knot results."""
@@ -0,0 +1,143 @@
+import pytest
+
+from game_state import MAX_BOARD_AREA, Player, create_game, dense_to_sparse, sparse_to_dense
+
+
+TREFOIL = [[0, 2, 1, 0], [2, -1, -1, 1], [3, -1, 8, 4], [0, 3, 4, 0]]
+
+
+def play_trefoil():
+    game = create_game(TREFOIL, "knotter")
+    game.make_move(1, 1, 9)
+    game.make_move(1, 2, 10)
+    return game
+
+
+def test_local_verdict_does_not_set_winner():
+    game = play_trefoil()
+    success, _ = game.make_move(2, 1, 10)
+    assert success and game.game_over
+    status = game.get_game_status()
+    assert status["local_jones_is_one"] is False
+    assert status["forced_jones_is_one"] is False
+    assert status["winner"] is None
+    assert status["is_unknot"] is None
+
+
+def test_forced_verdict_mid_game():
+    game = create_game(TREFOIL, "knotter")
+    assert game.get_game_status()["forced_jones_is_one"] is None
+    game.make_move(1, 2, 9)
+    game.make_move(2, 1, 10)
+    status = game.get_game_status()
+    assert status["local_jones_is_one"] is None
+    assert status["forced_jones_is_one"] is True
+
+
+def test_local_classification_uses_tracked_bracket():
+    game = play_trefoil()
+    assert game.local_classification() is None
+    game.make_move(2, 1, 10)
+    result = game.local_classification()
+    assert result["jones_is_one"] is False
+    assert result["num_crossings"] == 3
+
+    untracked = create_game(TREFOIL, "knotter")
+    untracked.bracket = None
+    for row, col, tile in [(1, 1, 9), (1, 2, 10), (2, 1, 10)]:
+        untracked.make_move(row, col, tile)
+    assert untracked.local_classification() == result
+
+
+def test_undo_restores_player_and_bracket():
+    game = play_trefoil()
+    game.make_move(2, 1, 10)
+    success, _ = game.undo_move(2, 1)
+    assert success
+    assert game.current_player == Player.KNOTTER
+    assert not game.game_over
+    assert game.get_game_status()["forced_jones_is_one"] is None
+
+
+def sparse_trefoil(offset):
+    tiles = [
+        [i + offset, j + offset, tile]
+        for i, row in enumerate(TREFOIL)
+        for j, tile in enumerate(row)
+        if tile != 0
+    ]
+    return {"rows": 1000, "cols": 1000, "tiles": tiles}
+
+
+def test_sparse_game_tracks_cropped_board():
+    game = create_game(sparse_trefoil(500), "knotter")
+    cropped, origin = game.get_cropped_board()
+    assert origin == (500, 500)
+    assert cropped == TREFOIL
+    game.make_move(501, 501, 9)
+    game.make_move(501, 502, 10)
+    game.make_move(502, 501, 10)
+    assert game.get_game_status()["local_jones_is_one"] is False
+    game.undo_move(502, 501)
+    game.make_move(502, 501, 9)
+    assert game.get_game_status()["local_jones_is_one"] is True
+
+
+@pytest.mark.parametrize("board", [
+    {"rows": 2, "cols": 2, "tiles": [[0, 0, 0], [0, 0, 2]]},
+    {"rows": 2, "cols": 2, "tiles": [[0, 0, True]]},
+    {"rows": True, "cols": 2, "tiles": []},
+    {"rows": 2, "cols": 2, "tiles": [[5, 0, 1]]},
+    {"rows": MAX_BOARD_AREA, "cols": 2, "tiles": []},
+])
+def test_invalid_sparse_boards_raise(board):
+    with pytest.raises(ValueError):
+        create_game(board, "knotter")
+
+
+def test_dense_sparse_round_trip():
+    sparse = dense_to_sparse(TREFOIL)
+    assert sparse["rows"] == 4 and sparse["cols"] == 4
+    assert [0, 0, 0] not in sparse["tiles"]
+    assert sparse_to_dense(sparse) == TREFOIL
+
+
+def test_explicit_empty_tiles_are_dropped():
+    game = create_game({"rows": 2, "cols": 2, "tiles": [[0, 0, 0], [1, 1, 5]]}, "knotter")
+    assert game.tiles == {(1, 1): 5}
+    assert game.get_sparse_board()["tiles"] == [[1, 1, 5]]
+
+
+def test_board_state_format_override():
+    game = create_game(sparse_trefoil(0), "knotter")
+    assert game.get_board_state()["tiles"] == dense_to_sparse(TREFOIL)["tiles"]
+    dense = game.get_board_state("dense")
+    assert len(dense) == 1000 and dense[1][1] == -1
+
+    dense_game = create_game(TREFOIL, "knotter")
+    assert dense_game.get_board_state("sparse") == dense_to_sparse(TREFOIL)
+    with pytest.raises(ValueError):
+        dense_game.get_board_state("csv")
+
+
+@pytest.mark.parametrize("board", [
+    {"rows": -1, "cols": 2},
+    [[0, 0], [0]],
+    "not a board",
+])
+def test_failed_reset_leaves_game_playable(board):
+    game = create_game(TREFOIL, "knotter")
+    with pytest.raises(ValueError):
+        game.reset_game(board)
+    assert game.get_dense_board() == TREFOIL
+    success, _ = game.make_move(1, 1, 9)
+    assert success
+
+
+def test_reset_with_board_replaces_initial_board():
+    game = create_game(TREFOIL, "knotter")
+    board = sparse_trefoil(3)
+    game.reset_game(board, Player.UNKNOTTER)
+    assert game.initial_board == board
+    assert game.starting_player_str == "unknotter"
+    assert game.count_initial_unresolved() == 3
@@ -0,0 +1,204 @@
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from kauffman_bracket import (
+    CROSSING_SMOOTHINGS,
+    MAX_SYMBOLIC_WORK,
+    LaurentPoly,
+    PartialBracket,
+    _trace_components,
+    classify_locally,
+    jones_polynomial,
+    kauffman_bracket,
+    num_components,
+    sweep_work,
+    writhe,
+)
+
+
+TREFOIL = [[0, 2, 1, 0], [2, 9, 10, 1], [3, 10, 8, 4], [0, 3, 4, 0]]
+MIRROR_TREFOIL = [[0, 2, 1, 0], [2, 10, 9, 1], [3, 9, 8, 4], [0, 3, 4, 0]]
+UNRESOLVED_TREFOIL = [[0, 2, 1, 0], [2, -1, -1, 1], [3, -1, 8, 4], [0, 3, 4, 0]]
+UNLINK = [[2, 1, 2, 1], [3, 4, 3, 4]]
+HOPF = [[2, 5, 1, 0], [6, 2, 9, 1], [3, 9, 4, 6], [0, 3, 5, 4]]
+
+SIDE_TILES = {
+    frozenset("LB"): 1, frozenset("BR"): 2, frozenset("TR"): 3,
+    frozenset("LT"): 4, frozenset("LR"): 5, frozenset("TB"): 6,
+}
+
+
+def random_mosaic(rng, rows, cols, squares, four_sided=(7, 8, 9, 10)):
+    """XOR of random 2x2 cell cycles: always a valid mosaic."""
+    horizontal, vertical = set(), set()
+    for _ in range(squares):
+        i, j = rng.randrange(rows - 1), rng.randrange(cols - 1)
+        horizontal ^= {(i, j), (i + 1, j)}
+        vertical ^= {(i, j), (i, j + 1)}
+    board = [[0] * cols for _ in range(rows)]
+    for i in range(rows):
+        for j in range(cols):
+            sides = {
+                side for side, present in (
+                    ("R", (i, j) in horizontal), ("L", (i, j - 1) in horizontal),
+                    ("B", (i, j) in vertical), ("T", (i - 1, j) in vertical),
+                ) if present
+            }
+            if len(sides) == 4:
+                board[i][j] = rng.choice(four_sided)
+            elif sides:
+                board[i][j] = SIDE_TILES[frozenset(sides)]
+    return board
+
+
+def brute_force_bracket(board):
+    """State sum over all 2^crossings smoothings, normalized so <O> = 1."""
+    crossings = [(i, j) for i, row in enumerate(board) for j, t in enumerate(row) if t in CROSSING_SMOOTHINGS]
+    loop = LaurentPoly(np.array([-1, 0, 0, 0, -1]), -2)
+    total = {}
+    for choice in itertools.product((0, 1), repeat=len(crossings)):
+        smoothed = [row[:] for row in board]
+        exponent = 0
+        for (i, j), c in zip(crossings, choice):
+            smoothed[i][j] = CROSSING_SMOOTHINGS[board[i][j]][c]
+            exponent += 1 if c == 0 else -1
+        term = LaurentPoly.monomial(exponent)
+        for _ in range(_trace_components(smoothed)[1] - 1):
+            term = term * loop
+        for e, c in term.to_dict().items():
+            total[e] = total.get(e, 0) + c
+    return {e: c for e, c in total.items() if c}
+
+
+def test_trefoil():
+    assert writhe(TREFOIL) == 3
+    assert str(jones_polynomial(TREFOIL)) == "t + t^3 - t^4"
+
+
+def test_mirror_trefoil():
+    assert writhe(MIRROR_TREFOIL) == -3
+    assert str(jones_polynomial(MIRROR_TREFOIL)) == "-t^-4 + t^-3 + t^-1"
+
+
+@pytest.mark.parametrize("tile", [9, 10])
+def test_kinked_unknot_has_trivial_jones(tile):
+    board = [[2, 1, 0], [3, tile, 1], [0, 3, 4]]
+    assert kauffman_bracket(board) != LaurentPoly.monomial(0)
+    assert jones_polynomial(board).is_one()
+
+
+def test_two_loop_unlink():
+    assert num_components(UNLINK) == 2
+    assert kauffman_bracket(UNLINK) == LaurentPoly(np.array([-1, 0, 0, 0, -1]), -2)
+    assert str(jones_polynomial(UNLINK)) == "-t^(-1/2) - t^(1/2)"
+
+
+def test_hopf_link():
+    assert num_components(HOPF) == 2
+    assert str(jones_polynomial(HOPF)) == "-t^(-5/2) - t^(-1/2)"
+
+
+def test_classify_locally():
+    result = classify_locally(TREFOIL)
+    assert result["jones_is_one"] is False
+    assert result["num_crossings"] == 3
+    assert classify_locally([[2, -1], [3, 4]]) is None
+
+
+@pytest.mark.parametrize("board", [
+    [[-1]],
+    [[2, 1, 0]],
+    [[0, 0], [0, 0]],
+    [[5]],
+])
+def test_invalid_boards_raise(board):
+    with pytest.raises(ValueError):
+        kauffman_bracket(board)
+
+
+def test_matches_brute_force_state_sum():
+    rng = random.Random(1)
+    checked = 0
+    while checked < 60:
+        board = random_mosaic(rng, rng.randint(2, 6), rng.randint(2, 6), rng.randint(1, 12))
+        crossings = sum(t in CROSSING_SMOOTHINGS for row in board for t in row)
+        if not any(t for row in board for t in row) or crossings > 10:
+            continue
+        assert kauffman_bracket(board).to_dict() == brute_force_bracket(board)
+        checked += 1
+
+
+def test_partial_bracket_matches_full_bracket():
+    positions = [(1, 1), (1, 2), (2, 1)]
+    for tiles in itertools.product((9, 10), repeat=3):
+        partial = PartialBracket(UNRESOLVED_TREFOIL)
+        board = [row[:] for row in UNRESOLVED_TREFOIL]
+        for (i, j), tile in zip(positions, tiles):
+            partial.resolve(i, j, tile)
+            board[i][j] = tile
+        assert partial.is_complete()
+        assert partial.writhe() == writhe(board)
+        assert partial.jones() == jones_polynomial(board)
+        assert partial.classification() == classify_locally(board)
+
+
+def test_partial_bracket_forced_verdict():
+    partial = PartialBracket(UNRESOLVED_TREFOIL)
+    assert partial.forced_jones_is_one() is None
+    partial.resolve(1, 2, 9)
+    partial.resolve(2, 1, 10)
+    assert partial.forced_jones_is_one() is True
+    partial.unresolve(1, 2)
+    partial.resolve(1, 2, 10)
+    assert partial.forced_jones_is_one() is None
+    partial.resolve(1, 1, 9)
+    assert partial.jones_is_one() is False
+
+
+def test_partial_bracket_random_resolve_and_unresolve():
+    rng = random.Random(7)
+    checked = 0
+    while checked < 40:
+        board = random_mosaic(rng, rng.randint(3, 6), rng.randint(3, 6), rng.randint(2, 16),
+                              four_sided=(7, 8, 9, 10, -1, -1, -1))
+        unresolved = [(i, j) for i, row in enumerate(board) for j, t in enumerate(row) if t == -1]
+        if not any(t for row in board for t in row) or len(unresolved) > 6:
+            continue
+        partial = PartialBracket(board)
+        current = [row[:] for row in board]
+        for _ in range(8):
+            done = [p for p in unresolved if current[p[0]][p[1]] != -1]
+            remaining = [p for p in unresolved if current[p[0]][p[1]] == -1]
+            if done and (not remaining or rng.random() < 0.3):
+                i, j = rng.choice(done)
+                current[i][j] = -1
+                partial.unresolve(i, j)
+            elif remaining:
+                i, j = rng.choice(remaining)
+                current[i][j] = rng.choice((9, 10))
+                partial.resolve(i, j, current[i][j])
+
+            remaining = [p for p in unresolved if current[p[0]][p[1]] == -1]
+            verdicts = set()
+            for tiles in itertools.product((9, 10), repeat=len(remaining)):
+                completed = [row[:] for row in current]
+                for (i, j), tile in zip(remaining, tiles):
+                    completed[i][j] = tile
+                verdicts.add(jones_polynomial(completed).is_one())
+            expected = verdicts.pop() if len(verdicts) == 1 else None
+            assert partial.forced_jones_is_one() == expected
+        checked += 1
+
+
+def test_sweep_work_bounds_partial_bracket():
+    rng = random.Random(11)
+    board = random_mosaic(rng, 12, 12, 144, four_sided=(9, 10))
+    crossings = [(i, j) for i, row in enumerate(board) for j, t in enumerate(row) if t in (9, 10)]
+    for i, j in rng.sample(crossings, 12):
+        board[i][j] = -1
+    assert sweep_work(board) > MAX_SYMBOLIC_WORK
+    with pytest.raises(ValueError):
+        PartialBracket(board)
@@ -0,0 +1,152 @@
+import os
+import subprocess
+import sys
+import threading
+from unittest import mock
+
+import pytest
+import requests
+
+import database
+import server
+
+
+@pytest.fixture(autouse=True)
+def finished_warm_up():
+    """Let the import-time warm-up thread finish before patching database."""
+    for thread in threading.enumerate():
+        if thread.name == "db-warm-up":
+            thread.join()
+
+
+@pytest.fixture
+def client():
+    return server.app.test_client()
+
+
+def ok_ping():
+    return True
+
+
+def failing_ping():
+    raise RuntimeError("mongo down")
+
+
+def classifier_response(status_code):
+    return lambda url, timeout: mock.Mock(status_code=status_code)
+
+
+def test_importing_server_does_not_load_numpy():
+    code = "import sys, server; sys.exit('numpy' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(server.__file__))
+    assert result.returncode == 0
+
+
+@pytest.mark.parametrize("path", ["/api/game/new", "/api/game/{id}/classify"])
+def test_bad_format_is_rejected(client, path):
+    created = client.post("/api/game/new", json={"board": [[2, 1], [3, 4]]})
+    game_id = created.get_json()["game_id"]
+    games_before = len(server.active_games)
+
+    response = client.post(path.format(id=game_id) + "?format=csv", json={"board": [[2, 1], [3, 4]]})
+    assert response.status_code == 400
+    assert len(server.active_games) == games_before
+    assert client.get(f"/api/game/{game_id}/status?format=csv").status_code == 400
+
+
+def test_health_is_liveness_only(client, monkeypatch):
+    monkeypatch.setattr(database, "ping", failing_ping)
+    response = client.get("/api/health")
+    assert response.status_code == 200
+    assert response.get_json()["status"] == "healthy"
+
+
+def test_ready_when_database_and_classifier_answer(client, monkeypatch):
+    monkeypatch.setattr(database, "ping", ok_ping)
+    monkeypatch.setattr(requests, "get", classifier_response(200))
+    response = client.get("/api/ready")
+    assert response.status_code == 200
+    assert response.get_json() == {
+        "status": "ready",
+        "checks": {"database": {"ok": True}, "classifier": {"ok": True}},
+    }
+
+
+def test_not_ready_when_database_fails(client, monkeypatch):
+    monkeypatch.setattr(database, "ping", failing_ping)
+    monkeypatch.setattr(requests, "get", classifier_response(200))
+    response = client.get("/api/ready")
+    body = response.get_json()
+    assert response.status_code == 503
+    assert body["status"] == "unavailable"
+    assert body["checks"]["database"] == {"ok": False, "error": "mongo down"}
+    assert body["checks"]["classifier"] == {"ok": True}
+
+
+def test_not_ready_when_classifier_errors(client, monkeypatch):
+    monkeypatch.setattr(database, "ping", ok_ping)
+    monkeypatch.setattr(requests, "get", classifier_response(500))
+    response = client.get("/api/ready")
+    body = response.get_json()
+    assert response.status_code == 503
+    assert body["checks"]["database"] == {"ok": True}
+    assert body["checks"]["classifier"] == {"ok": False, "error": "HTTP 500"}
+
+
+def test_not_ready_when_classifier_unreachable(client, monkeypatch):
+    def unreachable(url, timeout):
+        raise requests.exceptions.ConnectionError("refused")
+
+    monkeypatch.setattr(database, "ping", ok_ping)
+    monkeypatch.setattr(requests, "get", unreachable)
+    response = client.get("/api/ready")
+    assert response.status_code == 503
+    assert response.get_json()["checks"]["classifier"]["ok"] is False
+
+
+def fake_db(applied_versions):
+    db = {"migrations": mock.MagicMock()}
+    db["migrations"].find.return_value = [{"version": v} for v in applied_versions]
+    return db
+
+
+def test_migrate_skips_applied_versions(monkeypatch):
+    step_1, step_2 = mock.Mock(__name__="step_1"), mock.Mock(__name__="step_2")
+    db = fake_db([1])
+    monkeypatch.setattr(database, "get_db", lambda: db)
+    monkeypatch.setattr(database, "MIGRATIONS", [(1, step_1), (2, step_2)])
+
+    database.migrate()
+
+    step_1.assert_not_called()
+    step_2.assert_called_once_with(db)
+    recorded = db["migrations"].insert_one.call_args[0][0]
+    assert recorded["version"] == 2
+    db["migrations"].create_index.assert_called_once()
+
+
+def test_migrate_does_nothing_when_up_to_date(monkeypatch):
+    step_1 = mock.Mock(__name__="step_1")
+    db = fake_db([1])
+    monkeypatch.setattr(database, "get_db", lambda: db)
+    monkeypatch.setattr(database, "MIGRATIONS", [(1, step_1)])
+
+    database.migrate()
+
+    step_1.assert_not_called()
+    db["migrations"].create_index.assert_not_called()
+    db["migrations"].insert_one.assert_not_called()
+
+
+def test_migrate_treats_duplicate_key_as_recorded(monkeypatch):
+    step_1, step_2 = mock.Mock(__name__="step_1"), mock.Mock(__name__="step_2")
+    db = fake_db([])
+    db["migrations"].insert_one.side_effect = [database.DuplicateKeyError("dup"), None]
+    monkeypatch.setattr(database, "get_db", lambda: db)
+    monkeypatch.setattr(database, "MIGRATIONS", [(1, step_1), (2, step_2)])
+
+    database.migrate()
+
+    step_1.assert_called_once_with(db)
+    step_2.assert_called_once_with(db)
+    assert db["migrations"].insert_one.call_count == 2